@@ -0,0 +1,218 @@
+"""Per-process admission control for inbound calls.
+
+Tracks active calls and in-flight Gemini streams, caps both, and sheds new
+callers once capacity or the time-to-first-token SLO is exhausted, so calls
+already in progress keep their quality during a spike.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from config import (
+    ADMISSION_QUEUE_TIMEOUT_S,
+    LLM_FIRST_TOKEN_SLO_MS,
+    MAX_ACTIVE_CALLS,
+    MAX_LLM_STREAMS,
+    MAX_QUEUED_CALLS,
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a new call cannot be admitted."""
+
+
+class CallAbandoned(AdmissionRejected):
+    """Raised when the caller hangs up while waiting in the admission queue."""
+
+
+class AdmissionController:
+    # Weight of the newest sample in the first-token latency moving average
+    EWMA_ALPHA = 0.2
+    # Latency samples older than this no longer count as evidence of overload
+    SAMPLE_TTL_S = 30.0
+    # One slow response (e.g. a cold connection) is not evidence of overload
+    MIN_RECENT_SAMPLES = 5
+    # Latency alone sheds nothing; the process must also be this busy
+    SHED_LOAD_FRACTION = 0.8
+
+    def __init__(
+        self,
+        max_active_calls: int = MAX_ACTIVE_CALLS,
+        max_llm_streams: int = MAX_LLM_STREAMS,
+        max_queued_calls: int = MAX_QUEUED_CALLS,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_S,
+        first_token_slo_ms: float = LLM_FIRST_TOKEN_SLO_MS,
+    ) -> None:
+        self.max_active_calls = max_active_calls
+        self.max_llm_streams = max_llm_streams
+        self.max_queued_calls = max_queued_calls
+        self.queue_timeout = queue_timeout
+        self.first_token_slo_ms = first_token_slo_ms
+
+        self.active_calls = 0
+        self.queued_calls = 0
+        self.active_llm_streams = 0
+        self.admitted_total = 0
+        self.queued_total = 0
+        self.rejected_total = 0
+        self.abandoned_total = 0
+
+        self.first_token_ms: Optional[float] = None
+        self._sample_times: Deque[float] = deque()
+        self._slot_freed = asyncio.Condition()
+        self._llm_slots = asyncio.Semaphore(max_llm_streams)
+
+    def _recent_samples(self) -> int:
+        cutoff = time.monotonic() - self.SAMPLE_TTL_S
+        while self._sample_times and self._sample_times[0] < cutoff:
+            self._sample_times.popleft()
+        return len(self._sample_times)
+
+    def slo_at_risk(self) -> bool:
+        if self.first_token_ms is None or self._recent_samples() < self.MIN_RECENT_SAMPLES:
+            return False
+        return self.first_token_ms > self.first_token_slo_ms
+
+    def saturated(self) -> bool:
+        return (
+            self.active_calls >= self.SHED_LOAD_FRACTION * self.max_active_calls
+            or self.active_llm_streams >= self.max_llm_streams
+        )
+
+    def should_shed(self) -> bool:
+        # A slow upstream on an idle process is not fixed by turning callers away
+        return self.saturated() and self.slo_at_risk()
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected_total += 1
+        return AdmissionRejected(reason)
+
+    async def _take_slot(self) -> None:
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: self.active_calls < self.max_active_calls)
+            # Latency may have degraded while this caller was on hold
+            if self.should_shed():
+                raise self._reject("LLM first-token latency SLO at risk")
+            self.active_calls += 1
+
+    async def admit(
+        self,
+        on_queued: Optional[Callable[[], Awaitable[Any]]] = None,
+        hung_up: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> None:
+        """Take a call slot, waiting briefly in the queue if all slots are busy.
+
+        Args:
+            on_queued: Awaited once if the caller has to wait, e.g. to play a
+                holding message.
+            hung_up: Started if the caller has to wait; should complete when
+                the caller disconnects. Cancelled once admission is decided.
+
+        Raises:
+            AdmissionRejected: The process is busy and the SLO is at risk,
+                the queue is full, or no slot freed up within ``queue_timeout``.
+            CallAbandoned: The caller hung up while queued.
+        """
+        if self.should_shed():
+            raise self._reject("LLM first-token latency SLO at risk")
+
+        # Skip the queue only when nobody is already waiting in it
+        if self.active_calls < self.max_active_calls and not self.queued_calls:
+            self.active_calls += 1
+            self.admitted_total += 1
+            return
+
+        if self.queued_calls >= self.max_queued_calls:
+            raise self._reject("Admission queue full")
+
+        self.queued_calls += 1
+        self.queued_total += 1
+        watch = asyncio.ensure_future(hung_up()) if hung_up is not None else None
+        take: Optional[asyncio.Future] = None
+        admitted = False
+        try:
+            if on_queued is not None:
+                await on_queued()
+            take = asyncio.ensure_future(self._take_slot())
+            waiters = {take} if watch is None else {take, watch}
+            done, _ = await asyncio.wait(waiters, timeout=self.queue_timeout, return_when=asyncio.FIRST_COMPLETED)
+            if take in done:
+                take.result()
+                self.admitted_total += 1
+                admitted = True
+                return
+            if watch is not None and watch in done:
+                self.abandoned_total += 1
+                raise CallAbandoned("Caller hung up while queued")
+            raise self._reject("Timed out waiting for a call slot")
+        finally:
+            self.queued_calls -= 1
+            for task in (take, watch):
+                if task is not None and not task.done():
+                    task.cancel()
+            if not admitted and take is not None and take.done() and not take.cancelled() and take.exception() is None:
+                # Cancelled after the slot was taken; the handler never gets
+                # to release it, so give it back here
+                await asyncio.shield(self.release())
+
+    async def release(self) -> None:
+        async with self._slot_freed:
+            self.active_calls -= 1
+            self._slot_freed.notify_all()
+
+    def record_first_token(self, latency_ms: float) -> None:
+        # Restart the average after a quiet spell instead of blending in stale samples
+        if self.first_token_ms is None or not self._recent_samples():
+            self.first_token_ms = latency_ms
+        else:
+            self.first_token_ms += self.EWMA_ALPHA * (latency_ms - self.first_token_ms)
+        self._sample_times.append(time.monotonic())
+
+    @asynccontextmanager
+    async def llm_stream(self) -> AsyncIterator[Callable[[], None]]:
+        """Hold one of the LLM stream slots for the duration of a generation.
+
+        Yields a callback to invoke when the first token arrives; the measured
+        latency includes any time spent waiting for a slot.
+        """
+        started = time.monotonic()
+        recorded = False
+
+        def mark_first_token() -> None:
+            nonlocal recorded
+            if not recorded:
+                recorded = True
+                self.record_first_token((time.monotonic() - started) * 1000)
+
+        async with self._llm_slots:
+            self.active_llm_streams += 1
+            try:
+                yield mark_first_token
+            finally:
+                self.active_llm_streams -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Saturation metrics for orchestrators deciding when to scale out."""
+        return {
+            "active_calls": self.active_calls,
+            "max_active_calls": self.max_active_calls,
+            "queued_calls": self.queued_calls,
+            "max_queued_calls": self.max_queued_calls,
+            "active_llm_streams": self.active_llm_streams,
+            "max_llm_streams": self.max_llm_streams,
+            "llm_first_token_ms": self.first_token_ms,
+            "llm_first_token_slo_ms": self.first_token_slo_ms,
+            "slo_at_risk": self.slo_at_risk(),
+            "shedding": self.should_shed(),
+            "saturation": max(
+                self.active_calls / max(self.max_active_calls, 1),
+                self.active_llm_streams / max(self.max_llm_streams, 1),
+            ),
+            "admitted_total": self.admitted_total,
+            "queued_total": self.queued_total,
+            "rejected_total": self.rejected_total,
+            "abandoned_total": self.abandoned_total,
+        }
@@ -0,0 +1,114 @@
+"""Versioned, precompressed static assets for the dashboards.
+
+Assets are read once at startup, fingerprinted and compressed with every
+supported encoding, so serving a request is a dictionary lookup. HTML pages
+may reference other assets as ``{{name}}``; the placeholder is replaced by a
+versioned URL, letting those assets be cached forever.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+from httpcache import (
+    IMMUTABLE,
+    NO_CACHE,
+    SUPPORTED_ENCODINGS,
+    compress,
+    encoded_etag,
+    etag_matches,
+    make_etag,
+    negotiate_encoding,
+)
+
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+MEDIA_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([\w.\-]+)\s*\}\}")
+
+
+@dataclass(slots=True)
+class Asset:
+    name: str
+    media_type: str
+    etag: str
+    # Content encoding ("identity", "br", "gzip") -> body
+    bodies: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def version(self) -> str:
+        return self.etag.strip('"')[:12]
+
+
+class AssetStore:
+    def __init__(self, directory: Path = STATIC_DIR, url_prefix: str = "/assets") -> None:
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self._assets: Dict[str, Asset] = {}
+
+    def load(self, names: Iterable[str]) -> None:
+        """Read, version and precompress ``names``; pages are loaded last."""
+        names = sorted(names, key=lambda name: name.endswith(".html"))
+        for name in names:
+            path = self.directory / name
+            body = path.read_bytes()
+            if path.suffix == ".html":
+                body = _PLACEHOLDER.sub(lambda m: self.url(m.group(1)), body.decode("utf-8")).encode("utf-8")
+            asset = Asset(
+                name=name,
+                media_type=MEDIA_TYPES.get(path.suffix, "application/octet-stream"),
+                etag=make_etag(body),
+            )
+            asset.bodies["identity"] = body
+            for encoding in SUPPORTED_ENCODINGS:
+                compressed = compress(body, encoding)
+                if len(compressed) < len(body):
+                    asset.bodies[encoding] = compressed
+            self._assets[name] = asset
+
+    def get(self, name: str) -> Optional[Asset]:
+        return self._assets.get(name)
+
+    def url(self, name: str) -> str:
+        asset = self._assets.get(name)
+        if asset is None:
+            raise KeyError(f"Asset {name!r} must be loaded before it is referenced")
+        return f"{self.url_prefix}/{name}?v={asset.version}"
+
+    def response(self, request: Request, name: str) -> Response:
+        """Serve ``name`` in the best accepted encoding, honouring ``If-None-Match``.
+
+        Requests carrying the current ``?v=`` fingerprint may be cached
+        indefinitely; anything else must revalidate.
+        """
+        asset = self._assets.get(name)
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Asset not found")
+
+        available = [encoding for encoding in SUPPORTED_ENCODINGS if encoding in asset.bodies]
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), available)
+        versioned = request.query_params.get("v") == asset.version
+        headers = {
+            "ETag": encoded_etag(asset.etag, encoding) if encoding else asset.etag,
+            "Cache-Control": IMMUTABLE if versioned else NO_CACHE,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=asset.bodies[encoding or "identity"],
+            media_type=asset.media_type,
+            headers=headers,
+        )
@@ -0,0 +1,102 @@
+"""Benchmark cold start of the voice agent: import time and first-call latency.
+
+Each sample runs in a fresh interpreter so module caches do not hide import
+cost. The ``prewarm-idle`` mode ages the pool past its max age before the
+first call, as on a replica that sat idle. Exits non-zero when a median
+exceeds its budget or a prewarmed first call finds no fresh pooled
+resources, so it can guard against regressions in CI:
+
+    python bench_cold_start.py --runs 5 --max-import-ms 600 --max-first-call-ms 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+# Runs inside the child interpreter; prints one JSON line of timings
+PROBE = """
+import asyncio, json, os, time
+
+started = time.perf_counter()
+import main
+import_ms = (time.perf_counter() - started) * 1000
+
+async def first_call():
+    pool = main.call_resources
+    if os.environ.get("BENCH_IDLE"):
+        # Shorten the refresh period so the idle case runs in well under a second
+        pool.REFRESH_INTERVAL_S = 0.05
+    if main.STARTUP_MODE == "prewarm":
+        await pool.warm()
+    if os.environ.get("BENCH_IDLE"):
+        # Age the pool past MAX_AGE_S as if the replica sat idle, then give
+        # the background refresh a few periods to replace it
+        for resources in pool._pool:
+            resources.built_at -= pool.MAX_AGE_S
+        await asyncio.sleep(0.2)
+    fresh = sum(time.monotonic() - r.built_at <= pool.MAX_AGE_S for r in pool._pool)
+    started = time.perf_counter()
+    await pool.chat_node(admission=main.admission)
+    return (time.perf_counter() - started) * 1000, fresh
+
+first_call_ms, pool_fresh = asyncio.run(first_call())
+print(json.dumps({"import_ms": import_ms, "first_call_ms": first_call_ms, "pool_fresh": pool_fresh}))
+"""
+
+
+def sample(mode: str) -> dict:
+    # "<startup mode>-idle" ages the pool before the first call
+    startup_mode, _, variant = mode.partition("-")
+    env = dict(os.environ, STARTUP_MODE=startup_mode)
+    if variant == "idle":
+        env["BENCH_IDLE"] = "1"
+    # No request is made; the Gemini client only needs a key to construct
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=Path(__file__).parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["lazy", "prewarm", "prewarm-idle"])
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-first-call-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    failed = False
+    for mode in args.modes:
+        samples = [sample(mode) for _ in range(args.runs)]
+        import_ms = statistics.median(s["import_ms"] for s in samples)
+        first_call_ms = statistics.median(s["first_call_ms"] for s in samples)
+        pool_fresh = min(s["pool_fresh"] for s in samples)
+        print(f"{mode:>12}: import {import_ms:8.1f} ms   first call {first_call_ms:8.1f} ms   fresh pooled {pool_fresh}")
+
+        if args.max_import_ms is not None and import_ms > args.max_import_ms:
+            print(f"  import time over budget ({args.max_import_ms:.0f} ms)")
+            failed = True
+        # In lazy mode the first call pays for the deferred import by design
+        if mode.startswith("prewarm") and args.max_first_call_ms is not None and first_call_ms > args.max_first_call_ms:
+            print(f"  first call over budget ({args.max_first_call_ms:.0f} ms)")
+            failed = True
+        if mode.startswith("prewarm") and not pool_fresh:
+            print("  first call found no fresh pooled resources")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
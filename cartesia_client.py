@@ -1,8 +1,9 @@
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 import httpx
 
 from config import CARTESIA_API_KEY
+from serialization import loads
 
 
 API_BASE_URL = "https://api.cartesia.ai"
@@ -24,25 +25,52 @@ class CartesiaClient:
             timeout=httpx.Timeout(20.0, read=60.0),
         )
 
-    async def list_calls(self, agent_id: str, expand_transcript: bool = True, limit: int = 25) -> Dict[str, Any]:
+    async def __aenter__(self) -> "CartesiaClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _get_raw(self, path: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        resp = await self._client.get(path, params=params)
+        resp.raise_for_status()
+        return resp.content
+
+    async def list_calls_raw(self, agent_id: str, expand_transcript: bool = True, limit: int = 25) -> bytes:
+        # Undecoded upstream body, for callers that forward it unchanged
         params: Dict[str, Any] = {"agent_id": agent_id, "limit": limit}
         if expand_transcript:
             params["expand"] = "transcript"
-        resp = await self._client.get("/agents/calls", params=params)
-        resp.raise_for_status()
-        return resp.json()
+        return await self._get_raw("/agents/calls", params=params)
+
+    async def list_calls(self, agent_id: str, expand_transcript: bool = True, limit: int = 25) -> Dict[str, Any]:
+        return loads(await self.list_calls_raw(agent_id, expand_transcript=expand_transcript, limit=limit))
+
+    async def get_call_raw(self, call_id: str) -> bytes:
+        return await self._get_raw(f"/agents/calls/{call_id}")
 
     async def get_call(self, call_id: str) -> Dict[str, Any]:
-        resp = await self._client.get(f"/agents/calls/{call_id}")
-        resp.raise_for_status()
-        return resp.json()
+        return loads(await self.get_call_raw(call_id))
 
     async def stream_call_audio(self, call_id: str) -> httpx.Response:
-        # Caller is responsible for streaming bytes to client
-        resp = await self._client.get(f"/agents/calls/{call_id}/audio")
-        resp.raise_for_status()
+        # Status is checked before any body is read; the caller streams the
+        # bytes to its client and must aclose() the returned response
+        request = self._client.build_request("GET", f"/agents/calls/{call_id}/audio")
+        resp = await self._client.send(request, stream=True)
+        if resp.is_error:
+            await resp.aclose()
+            resp.raise_for_status()
         return resp
 
+    async def iter_call_audio(self, call_id: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        # Streams the recording in fixed-size chunks without buffering it whole
+        resp = await self.stream_call_audio(call_id)
+        try:
+            async for chunk in resp.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await resp.aclose()
+
     async def aclose(self) -> None:
         await self._client.aclose()
 
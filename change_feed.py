@@ -0,0 +1,174 @@
+"""In-process change feed for the leads dashboard, delivered over Server-Sent Events.
+
+A single ``CallPoller`` per process diffs the Cartesia call list and publishes
+only new or changed calls; lead decisions are published to the same feed.
+Every browser subscribes to the ``ChangeFeed`` instead of polling upstream.
+"""
+
+import asyncio
+import secrets
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from loguru import logger
+
+from cartesia_client import CartesiaClient
+from httpcache import make_etag
+from serialization import dumps
+
+
+@dataclass(slots=True)
+class FeedEvent:
+    seq: int
+    frame: bytes
+
+
+class ChangeFeed:
+    """Bounded history of published events with ``Last-Event-ID`` resume.
+
+    Event ids are ``<epoch>.<seq>``; the epoch changes on every process start,
+    so a browser resuming against a restarted (or different) process receives
+    a ``reset`` event and reloads instead of silently missing changes.
+    """
+
+    def __init__(self, history: int = 1000, heartbeat: float = 15.0) -> None:
+        self.epoch = secrets.token_hex(4)
+        self.heartbeat = heartbeat
+        self._events: Deque[FeedEvent] = deque(maxlen=history)
+        self._seq = 0
+        self._changed = asyncio.Condition()
+        self._closed = False
+
+    def _event_id(self, seq: int) -> str:
+        return f"{self.epoch}.{seq}"
+
+    async def publish(self, event: str, payload: Any) -> None:
+        # Encode once; the same frame is written to every subscriber
+        async with self._changed:
+            self._seq += 1
+            frame = b"id: %s\nevent: %s\ndata: %s\n\n" % (
+                self._event_id(self._seq).encode(),
+                event.encode(),
+                dumps(payload),
+            )
+            self._events.append(FeedEvent(seq=self._seq, frame=frame))
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        """End every subscriber stream, so the server can finish shutting down."""
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    def _resume_cursor(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequence number to resume after, or ``None`` if the history has a gap."""
+        if not last_event_id:
+            return self._seq
+        epoch, _, seq = last_event_id.partition(".")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        cursor = int(seq)
+        oldest = self._events[0].seq if self._events else self._seq + 1
+        if cursor > self._seq or cursor < oldest - 1:
+            return None
+        return cursor
+
+    def _reset_frame(self) -> bytes:
+        return b"id: %s\nevent: reset\ndata: {}\n\n" % self._event_id(self._seq).encode()
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Yield SSE frames published after ``last_event_id`` until the feed is closed."""
+        # Take the cursor before the first frame so nothing published after
+        # the client sees the stream open can fall in between
+        cursor = self._resume_cursor(last_event_id)
+        yield b"retry: 3000\n\n"
+        if cursor is None:
+            cursor = self._seq
+            yield self._reset_frame()
+
+        while not self._closed:
+            if self._events and self._events[0].seq > cursor + 1:
+                # Fell behind the retained history; the client must reload
+                cursor = self._seq
+                yield self._reset_frame()
+                continue
+            pending = [event for event in self._events if event.seq > cursor]
+            if pending:
+                for event in pending:
+                    yield event.frame
+                cursor = pending[-1].seq
+                continue
+            try:
+                async with self._changed:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: self._seq > cursor or self._closed),
+                        timeout=self.heartbeat,
+                    )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+
+
+class CallPoller:
+    """Poll Cartesia for an agent's calls and publish new or changed ones."""
+
+    def __init__(self, feed: ChangeFeed, agent_id: str, interval: float = 5.0, limit: int = 25) -> None:
+        self.feed = feed
+        self.agent_id = agent_id
+        self.interval = interval
+        self.limit = limit
+        self._fingerprints: Dict[str, str] = {}
+        self._seeded = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        try:
+            client = CartesiaClient()
+        except RuntimeError as exc:
+            logger.error(f"Call poller disabled: {exc}")
+            return
+        async with client:
+            while True:
+                try:
+                    await self.poll_once(client)
+                except Exception:
+                    # A malformed payload must not stop the feed for good
+                    logger.exception("Call poll failed")
+                await asyncio.sleep(self.interval)
+
+    async def poll_once(self, client: CartesiaClient) -> None:
+        # Transcripts are not needed to detect changes, so skip the expansion
+        data = await client.list_calls(self.agent_id, expand_transcript=False, limit=self.limit)
+        calls = data.get("data") or []
+        changed = []
+        for call in calls:
+            fingerprint = make_etag(dumps(call))
+            if self._fingerprints.get(call["id"]) != fingerprint:
+                self._fingerprints[call["id"]] = fingerprint
+                changed.append(call)
+
+        # Forget calls that fell out of the window so memory stays bounded
+        current = {call["id"] for call in calls}
+        for call_id in list(self._fingerprints):
+            if call_id not in current:
+                del self._fingerprints[call_id]
+
+        # The first poll only seeds state; browsers load the list themselves
+        if not self._seeded:
+            self._seeded = True
+            return
+        for call in reversed(changed):
+            await self.feed.publish("call", call)
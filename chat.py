@@ -1,7 +1,11 @@
 """ChatNode - Handles basic conversations using Gemini."""
 
-from typing import AsyncGenerator
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import AsyncGenerator, Optional
 
+from admission import AdmissionController
 from config import CHAT_MODEL_ID, CHAT_TEMPERATURE
 from google.genai import Client
 from google.genai.types import GenerateContentConfig, GenerateContentResponse, ThinkingConfig
@@ -14,35 +18,63 @@ from loguru import logger
 from prompts import GOODBYE_PROMPT, get_chat_system_prompt
 
 
+@dataclass(slots=True)
+class ChatResources:
+    """Per-call Gemini configuration that can be built ahead of the call."""
+
+    system_prompt: str
+    generation_config: GenerateContentConfig
+    built_at: float
+
+
+def build_chat_resources() -> ChatResources:
+    """Build the system prompt, tool list and Gemini config for one call."""
+    system_prompt = get_chat_system_prompt()
+
+    tools = []
+    # Add the EndCallTool if we don't have a goodbye prompt for ending the call
+    if not GOODBYE_PROMPT:
+        tools.append(EndCallTool.to_gemini_tool())
+
+    generation_config = GenerateContentConfig(
+        system_instruction=system_prompt,
+        temperature=CHAT_TEMPERATURE,
+        thinking_config=ThinkingConfig(thinking_budget=0),
+        tools=tools,
+    )
+    return ChatResources(system_prompt, generation_config, built_at=time.monotonic())
+
+
 class ChatNode(ReasoningNode):
     """Voice-optimized ReasoningNode for basic chat using Gemini streaming.
 
     Provides simple conversation capabilities without external tools or search.
     """
 
-    def __init__(self, max_context_length: int = 100):
+    def __init__(
+        self,
+        max_context_length: int = 100,
+        admission: Optional[AdmissionController] = None,
+        resources: Optional[ChatResources] = None,
+        client: Optional[Client] = None,
+    ):
         """Initialize the Voice reasoning node with proven Gemini configuration.
 
         Args:
             max_context_length: Maximum number of conversation turns to keep.
+            admission: Process-wide controller that caps concurrent Gemini
+                streams and records their first-token latency.
+            resources: Prebuilt prompt and Gemini config; built here if omitted.
+            client: Gemini client to share across calls; created here if omitted.
         """
-        self.system_prompt = get_chat_system_prompt()
+        resources = resources or build_chat_resources()
+        self.system_prompt = resources.system_prompt
         super().__init__(self.system_prompt, max_context_length)
+        self.admission = admission
 
-        self.tools = []
-
-        # Add the EndCallTool if we don't have a goodbye prompt for ending the call
-        if not GOODBYE_PROMPT:
-            self.tools.append(EndCallTool.to_gemini_tool())
-
-        # Initialize Gemini client and configuration
-        self.client = Client()
-        self.generation_config = GenerateContentConfig(
-            system_instruction=self.system_prompt,
-            temperature=CHAT_TEMPERATURE,
-            thinking_config=ThinkingConfig(thinking_budget=0),
-            tools=self.tools,
-        )
+        self.generation_config = resources.generation_config
+        self.tools = self.generation_config.tools
+        self.client = client or Client()
 
     async def process_context(
         self, context: ConversationContext
@@ -63,30 +95,33 @@ class ChatNode(ReasoningNode):
             logger.info(f'🧠 Processing user message: "{user_message}"')
 
         full_response = ""
-        stream: AsyncGenerator[
-            GenerateContentResponse
-        ] = await self.client.aio.models.generate_content_stream(
-            model=CHAT_MODEL_ID,
-            contents=messages,
-            config=self.generation_config,
-        )
-
-        async for msg in stream:
-            if msg.text:
-                full_response += msg.text
-                yield AgentResponse(content=msg.text)
-
-            if msg.function_calls:
-                for function_call in msg.function_calls:
-                    if function_call.name == EndCallTool.name():
-                        goodbye_message = function_call.args.get("goodbye_message", "Goodbye!")
-                        args = EndCallArgs(goodbye_message=goodbye_message)
-                        logger.info(
-                            f"🤖 End call tool called. Ending conversation with goodbye message: "
-                            f"{args.goodbye_message}"
-                        )
-                        async for item in end_call(args):
-                            yield item
+        llm_stream = self.admission.llm_stream() if self.admission else nullcontext(lambda: None)
+        async with llm_stream as mark_first_token:
+            stream: AsyncGenerator[
+                GenerateContentResponse
+            ] = await self.client.aio.models.generate_content_stream(
+                model=CHAT_MODEL_ID,
+                contents=messages,
+                config=self.generation_config,
+            )
+
+            async for msg in stream:
+                mark_first_token()
+                if msg.text:
+                    full_response += msg.text
+                    yield AgentResponse(content=msg.text)
+
+                if msg.function_calls:
+                    for function_call in msg.function_calls:
+                        if function_call.name == EndCallTool.name():
+                            goodbye_message = function_call.args.get("goodbye_message", "Goodbye!")
+                            args = EndCallArgs(goodbye_message=goodbye_message)
+                            logger.info(
+                                f"🤖 End call tool called. Ending conversation with goodbye message: "
+                                f"{args.goodbye_message}"
+                            )
+                            async for item in end_call(args):
+                                yield item
 
         if full_response:
             logger.info(f'🤖 Agent response: "{full_response}" ({len(full_response)} chars)')
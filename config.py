@@ -14,6 +14,14 @@ import os
 CHAT_MODEL_ID = "gemini-2.5-flash-lite"
 CHAT_TEMPERATURE = 0.7
 
+##################################################
+####            Startup Settings            ####
+##################################################
+# "prewarm" imports Gemini and prebuilds call resources before the server
+# reports ready; "lazy" defers that work to the first call
+STARTUP_MODE = os.getenv("STARTUP_MODE", "prewarm")
+PREWARM_POOL_SIZE = int(os.getenv("PREWARM_POOL_SIZE", "2"))
+
 
 ##################################################
 ####             Agent Context              ####
@@ -31,6 +39,21 @@ CARTESIA_API_KEY = os.getenv("CARTESIA_API_KEY", "")
 AGENT_ID = os.getenv("AGENT_ID", "agent_tLP2HN5nF4SMpHBSYMWzZY")
 AGENT_PHONE_E164 = os.getenv("AGENT_PHONE_E164", "+12173874858")
 
+# How often the leads dashboard polls Cartesia for new or changed calls
+CALL_POLL_INTERVAL_S = float(os.getenv("CALL_POLL_INTERVAL_S", "5"))
+
+##################################################
+####        Admission Control               ####
+##################################################
+# Per-process limits; callers beyond them are briefly queued, then turned away
+MAX_ACTIVE_CALLS = int(os.getenv("MAX_ACTIVE_CALLS", "20"))
+MAX_LLM_STREAMS = int(os.getenv("MAX_LLM_STREAMS", "10"))
+MAX_QUEUED_CALLS = int(os.getenv("MAX_QUEUED_CALLS", "5"))
+ADMISSION_QUEUE_TIMEOUT_S = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "8"))
+
+# Gemini time-to-first-token SLO; new calls are rejected while it is exceeded under load
+LLM_FIRST_TOKEN_SLO_MS = float(os.getenv("LLM_FIRST_TOKEN_SLO_MS", "1500"))
+
 ##################################################
 ####        Agent Prompt                   ####
 ##################################################
@@ -43,3 +66,7 @@ AGENT_PROMPT = "You are a helpful and efficient home renovation and repair agent
 ##################################################
 # This message is sent by the agent to the user when the call is started.
 INITIAL_MESSAGE = "Hello! I'm here to help you with your home renovation or repair needs. To get started, could I please get your name?"
+
+# Said to callers waiting for a free slot, and to callers turned away at capacity
+HOLD_MESSAGE = "Thanks for calling! Please hold for just a moment while we connect you."
+OVERFLOW_MESSAGE = "Thanks for calling! All of our agents are busy right now. Please call back in a few minutes. Goodbye!"
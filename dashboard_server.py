@@ -1,208 +1,285 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import os
+import re
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 
-from fastapi import FastAPI, HTTPException, Response
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+import httpx
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
+from pydantic import BaseModel
 
+from assets import AssetStore
 from cartesia_client import CartesiaClient
-from config import AGENT_ID
+from change_feed import CallPoller, ChangeFeed
+from config import AGENT_ID, CALL_POLL_INTERVAL_S
+from httpcache import CompressionMiddleware, cached_response
+from lead_export import MEDIA_TYPES as EXPORT_MEDIA_TYPES, iter_leads, stream_export
+from serialization import ORJSONResponse, dumps, loads
+from waveform import PeakAccumulator, UnsupportedAudio
 
 
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 LEADS_FILE = DATA_DIR / "leads.json"
+PEAKS_DIR = DATA_DIR / "peaks"
+PEAKS_DIR.mkdir(exist_ok=True)
+
+# Call ids become file names, so only allow a conservative character set
+_CALL_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
 
 
 def _read_leads() -> Dict[str, Any]:
     if not LEADS_FILE.exists():
         return {"accepted": {}, "declined": {}}
     try:
-        return json.loads(LEADS_FILE.read_text(encoding="utf-8"))
+        return loads(LEADS_FILE.read_bytes())
     except Exception:
         return {"accepted": {}, "declined": {}}
 
 
+def _write_atomic(path: Path, body: bytes) -> None:
+    # Write-then-rename so readers never observe a half-written file
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+
 def _write_leads(data: Dict[str, Any]) -> None:
-    LEADS_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_atomic(LEADS_FILE, dumps(data, indent=True))
 
 
-app = FastAPI(title="Renovation Leads Dashboard")
+# Serializes read-modify-write cycles on the leads file within this process
+_leads_lock = asyncio.Lock()
 
+LEAD_STATUSES = {"accept": "accepted", "decline": "declined"}
 
-@app.get("/", response_class=HTMLResponse)
-async def dashboard() -> str:
-    # Minimal client-side UI; calls our API routes
-    return (
-        """
-<!doctype html>
-<html>
-  <head>
-    <meta charset="utf-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1" />
-    <title>Leads Dashboard</title>
-    <style>
-      body { font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial; margin: 24px; }
-      .row { display: grid; grid-template-columns: 360px 1fr; gap: 24px; }
-      .card { border: 1px solid #e2e2e2; border-radius: 8px; padding: 12px; }
-      .btn { padding: 6px 10px; border: 1px solid #444; border-radius: 6px; background: white; cursor: pointer; }
-      .btn.primary { background: #0b5; color: white; border: none; }
-      .btn.danger { background: #d33; color: white; border: none; }
-      .pill { display: inline-block; padding: 2px 8px; border-radius: 999px; background: #f3f3f3; }
-      .muted { color: #666; }
-      ul { list-style: none; padding: 0; margin: 0; }
-      li { padding: 8px; border-bottom: 1px solid #eee; cursor: pointer; }
-      li:hover { background: #fafafa; }
-      audio { width: 100%; margin-top: 8px; }
-      .mono { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace; }
-    </style>
-  </head>
-  <body>
-    <h1>Leads Dashboard</h1>
-    <div class="row">
-      <div class="card">
-        <h3>Recent Calls</h3>
-        <ul id="calls"></ul>
-      </div>
-      <div class="card">
-        <h3 id="title">Select a call</h3>
-        <div id="details" class="muted">No call selected.</div>
-      </div>
-    </div>
-    <script>
-      const callsEl = document.getElementById('calls');
-      const detailsEl = document.getElementById('details');
-      const titleEl = document.getElementById('title');
-
-      async function loadCalls() {
-        const res = await fetch('/api/calls');
-        const data = await res.json();
-        callsEl.innerHTML = '';
-        (data.data || []).forEach(call => {
-          const li = document.createElement('li');
-          const when = call.start_time || 'N/A';
-          const status = call.status;
-          const caller = call.telephony_params?.to || 'Unknown';
-          li.innerHTML = `<div><strong>${caller}</strong> <span class="pill">${status}</span></div><div class="muted">${when}</div>`;
-          li.onclick = () => selectCall(call.id);
-          callsEl.appendChild(li);
-        });
-      }
-
-      async function selectCall(id) {
-        titleEl.textContent = `Call ${id}`;
-        detailsEl.innerHTML = 'Loading...';
-        const [callRes, metaRes] = await Promise.all([
-          fetch(`/api/calls/${id}`),
-          fetch('/api/leads')
-        ]);
-        const call = await callRes.json();
-        const leads = await metaRes.json();
-        const accepted = !!leads.accepted[id];
-        const declined = !!leads.declined[id];
-
-        const transcript = call.transcript || [];
-        const lines = transcript.map(t => `${t.role}: ${t.text || ''}`).join('\n');
-
-        detailsEl.innerHTML = `
-          <div>
-            <div><strong>Status:</strong> ${call.status}</div>
-            <div><strong>From:</strong> ${call.telephony_params?.to || ''}</div>
-            <div><strong>To:</strong> ${call.telephony_params?.from || ''}</div>
-            <div><strong>Summary:</strong> ${call.summary || ''}</div>
-            <div class="mono" style="white-space: pre-wrap; margin-top: 8px;">${lines}</div>
-            <audio controls src="/api/calls/${id}/audio"></audio>
-            <div style="margin-top: 8px; display: flex; gap: 8px;">
-              <button class="btn primary" onclick="acceptLead('${id}')" ${accepted ? 'disabled' : ''}>Accept Lead</button>
-              <button class="btn danger" onclick="declineLead('${id}')" ${declined ? 'disabled' : ''}>Decline</button>
-            </div>
-          </div>
-        `;
-      }
-
-      async function acceptLead(id) {
-        await fetch(`/api/calls/${id}/accept`, { method: 'POST' });
-        await selectCall(id);
-      }
-      async function declineLead(id) {
-        await fetch(`/api/calls/${id}/decline`, { method: 'POST' });
-        await selectCall(id);
-      }
-
-      loadCalls();
-    </script>
-  </body>
-</html>
-        """
-    )
 
+def _apply_decision(data: Dict[str, Any], call_id: str, status: str) -> None:
+    other = "declined" if status == "accepted" else "accepted"
+    data.setdefault(status, {})[call_id] = True
+    # A call is either accepted or declined, never both
+    data.setdefault(other, {}).pop(call_id, None)
 
-@app.get("/api/calls")
-async def api_list_calls(limit: int = 25) -> JSONResponse:
-    async with CartesiaClient() as _:
-        pass
-    client = CartesiaClient()
+
+class LeadDecision(BaseModel):
+    call_id: str
+    decision: Literal["accept", "decline"]
+
+
+class BulkLeadDecisions(BaseModel):
+    decisions: List[LeadDecision]
+
+
+# Fingerprint and precompress the UI once per process
+assets = AssetStore()
+assets.load(["leads.css", "leads.js", "leads.html"])
+
+# One feed and one upstream poller per process, shared by every browser
+feed = ChangeFeed()
+poller = CallPoller(feed, AGENT_ID, interval=CALL_POLL_INTERVAL_S)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    poller.start()
     try:
-        data = await client.list_calls(AGENT_ID, expand_transcript=True, limit=limit)
+        yield
     finally:
-        await client.aclose()
-    return JSONResponse(data)
+        await feed.close()
+        await poller.stop()
+
+
+app = FastAPI(title="Renovation Leads Dashboard", default_response_class=ORJSONResponse, lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard(request: Request) -> Response:
+    # Minimal client-side UI served from static/; calls our API routes
+    return assets.response(request, "leads.html")
+
+
+@app.get("/assets/{name}")
+async def dashboard_asset(request: Request, name: str) -> Response:
+    return assets.response(request, name)
+
+
+@app.get("/api/calls")
+async def api_list_calls(request: Request, limit: int = 25) -> Response:
+    # Forward the upstream bytes as-is; there is nothing to transform
+    async with CartesiaClient() as client:
+        raw = await client.list_calls_raw(AGENT_ID, expand_transcript=True, limit=limit)
+    return cached_response(request, raw)
 
 
 @app.get("/api/calls/{call_id}")
-async def api_get_call(call_id: str) -> JSONResponse:
-    client = CartesiaClient()
-    try:
-        data = await client.get_call(call_id)
-    finally:
-        await client.aclose()
-    return JSONResponse(data)
+async def api_get_call(request: Request, call_id: str) -> Response:
+    async with CartesiaClient() as client:
+        raw = await client.get_call_raw(call_id)
+    return cached_response(request, raw)
+
+
+@app.get("/api/events")
+async def api_events(last_event_id: Optional[str] = Header(default=None)) -> StreamingResponse:
+    # EventSource resends the last id it saw as Last-Event-ID when reconnecting
+    return StreamingResponse(
+        feed.subscribe(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _upstream_error(exc: httpx.HTTPStatusError) -> HTTPException:
+    if exc.response.status_code == 404:
+        return HTTPException(status_code=404, detail="Recording not found")
+    return HTTPException(status_code=502, detail=f"Upstream returned {exc.response.status_code}")
 
 
 @app.get("/api/calls/{call_id}/audio")
 async def api_get_call_audio(call_id: str) -> StreamingResponse:
     client = CartesiaClient()
+    # Open upstream before responding so its errors surface as our status code
     try:
         resp = await client.stream_call_audio(call_id)
-        async def _gen():
-            async for chunk in resp.aiter_bytes():
-                yield chunk
-        return StreamingResponse(_gen(), media_type="audio/wav")
-    finally:
+    except httpx.HTTPStatusError as exc:
+        await client.aclose()
+        raise _upstream_error(exc) from exc
+    except BaseException:
         await client.aclose()
+        raise
+
+    async def _gen():
+        # The client must outlive the handler; close it once streaming ends
+        try:
+            async for chunk in resp.aiter_bytes(64 * 1024):
+                yield chunk
+        finally:
+            await resp.aclose()
+            await client.aclose()
+
+    return StreamingResponse(_gen(), media_type="audio/wav")
+
+
+# Peak computations in flight, so concurrent requests share one upstream fetch
+_peaks_inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+
+def _peaks_done(call_id: str, task: "asyncio.Future[bytes]") -> None:
+    _peaks_inflight.pop(call_id, None)
+    # Retrieve the exception so it is not reported as unhandled when every
+    # requester has already disconnected; waiting requesters still see it
+    if not task.cancelled():
+        task.exception()
+
+
+async def _compute_peaks(call_id: str) -> bytes:
+    accumulator = PeakAccumulator()
+    async with CartesiaClient() as client:
+        async for chunk in client.iter_call_audio(call_id):
+            accumulator.feed(chunk)
+    body = dumps({"call_id": call_id, **accumulator.result()})
+    _write_atomic(PEAKS_DIR / f"{call_id}.json", body)
+    return body
+
+
+@app.get("/api/calls/{call_id}/peaks")
+async def api_get_call_peaks(request: Request, call_id: str) -> Response:
+    if not _CALL_ID_RE.match(call_id):
+        raise HTTPException(status_code=400, detail="Invalid call id")
+
+    path = PEAKS_DIR / f"{call_id}.json"
+    if path.exists():
+        return cached_response(request, path.read_bytes())
+
+    task = _peaks_inflight.get(call_id)
+    if task is None:
+        task = asyncio.ensure_future(_compute_peaks(call_id))
+        _peaks_inflight[call_id] = task
+        task.add_done_callback(partial(_peaks_done, call_id))
+    try:
+        # Shielded so one client disconnecting does not abort the shared computation
+        body = await asyncio.shield(task)
+    except httpx.HTTPStatusError as exc:
+        raise _upstream_error(exc) from exc
+    except UnsupportedAudio as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return cached_response(request, body)
 
 
 @app.get("/api/leads")
-async def api_leads() -> JSONResponse:
-    return JSONResponse(_read_leads())
+async def api_leads(request: Request) -> Response:
+    return cached_response(request, dumps(_read_leads()))
 
 
 @app.post("/api/calls/{call_id}/accept")
 async def api_accept(call_id: str) -> Response:
-    data = _read_leads()
-    data.setdefault("accepted", {})[call_id] = True
-    # If previously declined, remove it
-    data.setdefault("declined", {}).pop(call_id, None)
-    _write_leads(data)
+    async with _leads_lock:
+        data = _read_leads()
+        _apply_decision(data, call_id, "accepted")
+        _write_leads(data)
+    await feed.publish("lead", {"call_id": call_id, "status": "accepted"})
     return Response(status_code=204)
 
 
 @app.post("/api/calls/{call_id}/decline")
 async def api_decline(call_id: str) -> Response:
-    data = _read_leads()
-    data.setdefault("declined", {})[call_id] = True
-    data.setdefault("accepted", {}).pop(call_id, None)
-    _write_leads(data)
+    async with _leads_lock:
+        data = _read_leads()
+        _apply_decision(data, call_id, "declined")
+        _write_leads(data)
+    await feed.publish("lead", {"call_id": call_id, "status": "declined"})
     return Response(status_code=204)
 
 
+@app.post("/api/leads/bulk")
+async def api_bulk_decide(body: BulkLeadDecisions) -> Dict[str, int]:
+    # All decisions land in a single write; later entries for a call win
+    async with _leads_lock:
+        data = _read_leads()
+        for item in body.decisions:
+            _apply_decision(data, item.call_id, LEAD_STATUSES[item.decision])
+        _write_leads(data)
+    for item in body.decisions:
+        await feed.publish("lead", {"call_id": item.call_id, "status": LEAD_STATUSES[item.decision]})
+    return {"applied": len(body.decisions)}
+
+
+@app.get("/api/leads/export")
+async def api_export_leads(
+    format: Literal["csv", "ndjson"] = "csv",
+    status: Literal["all", "accepted", "declined"] = "all",
+    concurrency: int = Query(default=8, ge=1, le=32),
+) -> StreamingResponse:
+    leads = list(iter_leads(_read_leads(), status))
+    # Created here so a missing API key is an error, not an empty 200 download
+    client = CartesiaClient()
+    return StreamingResponse(
+        stream_export(client, leads, format, concurrency=concurrency),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="leads-{status}.{format}"'},
+    )
+
+
 def run() -> None:
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    class Server(uvicorn.Server):
+        async def on_tick(self, counter: int) -> bool:
+            should_exit = await super().on_tick(counter)
+            if should_exit:
+                # Uvicorn waits for open responses before lifespan shutdown,
+                # and event streams only end once the feed is closed
+                await feed.close()
+            return should_exit
+
+    # Backstop for any other response that will not finish on its own
+    config = uvicorn.Config(app, host="0.0.0.0", port=8080, timeout_graceful_shutdown=10)
+    Server(config).run()
 
 
 if __name__ == "__main__":
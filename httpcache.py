@@ -0,0 +1,174 @@
+"""Conditional GET and response compression helpers for the dashboards."""
+
+import gzip
+import hashlib
+from typing import Iterable, Optional
+
+import brotli
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Preferred first when the client accepts several
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+# Dynamic responses are cheap to refetch once validated, so always revalidate
+NO_CACHE = "no-cache"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Scope entry where CompressionMiddleware records itself and the negotiated encoding
+COMPRESSION_SCOPE_KEY = "httpcache.compression"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the uncompressed body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    # Each encoding is a distinct representation, so it needs its own strong tag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header value lists exactly ``etag``.
+
+    ``If-None-Match`` uses weak comparison, so a ``W/`` prefix is ignored.
+    Encoded representations have their own tags and must be matched as such.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """Pick the preferred content coding from an ``Accept-Encoding`` header."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def cached_response(
+    request: Request,
+    body: bytes,
+    *,
+    media_type: str = "application/json",
+    cache_control: str = NO_CACHE,
+) -> Response:
+    """Build a response carrying a strong ETag, or ``304`` if the client has it.
+
+    Under ``CompressionMiddleware`` the client must hold the tag of the
+    encoding that would be sent now, not just any encoding of the body.
+    """
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    current = etag
+    compression = request.scope.get(COMPRESSION_SCOPE_KEY)
+    if compression is not None:
+        middleware, encoding = compression
+        if middleware.compresses(media_type, len(body)):
+            current = encoded_etag(etag, encoding)
+    if etag_matches(request.headers.get("if-none-match"), current):
+        # The middleware leaves 304s alone, so send the tag the client holds
+        headers["ETag"] = current
+        if compression is not None:
+            headers["Vary"] = "Accept-Encoding"
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """Compress buffered dynamic responses (JSON by default) with brotli or gzip.
+
+    Streaming responses and bodies that already carry a ``Content-Encoding``
+    (e.g. precompressed assets) pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 512,
+        media_types: Iterable[str] = ("application/json",),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = tuple(media_types)
+
+    def compresses(self, media_type: str, size: int) -> bool:
+        """Whether a complete body of this type and size would be compressed."""
+        return media_type.split(";")[0].strip() in self.media_types and size >= self.minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        # Lets cached_response validate against the representation sent now
+        scope[COMPRESSION_SCOPE_KEY] = (self, encoding)
+
+        pending_start: Optional[Message] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                if media_type in self.media_types and "content-encoding" not in headers:
+                    # Hold the start message until we know whether the body is compressible
+                    pending_start = message
+                    return
+                await send(message)
+                return
+
+            if message["type"] == "http.response.body" and pending_start is not None:
+                start, pending_start = pending_start, None
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                body = message.get("body", b"")
+                if message.get("more_body", False) or len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    return
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
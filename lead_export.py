@@ -0,0 +1,129 @@
+"""Streaming export of triaged leads joined with Cartesia call data."""
+
+import asyncio
+import csv
+import io
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from cartesia_client import CartesiaClient
+from serialization import dumps
+
+
+EXPORT_FIELDS = [
+    "call_id",
+    "lead_status",
+    "status",
+    "start_time",
+    "end_time",
+    "caller",
+    "agent_number",
+    "summary",
+    "transcript",
+    "error",
+]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def iter_leads(leads: Dict[str, Any], status: str = "all") -> Iterable[Tuple[str, str]]:
+    """Yield ``(call_id, lead_status)`` pairs for the requested status."""
+    for lead_status in ("accepted", "declined"):
+        if status in ("all", lead_status):
+            for call_id, flagged in leads.get(lead_status, {}).items():
+                if flagged:
+                    yield call_id, lead_status
+
+
+def _join(call_id: str, lead_status: str, call: Optional[Dict[str, Any]], error: str = "") -> Dict[str, Any]:
+    call = call or {}
+    telephony = call.get("telephony_params") or {}
+    return {
+        "call_id": call_id,
+        "lead_status": lead_status,
+        "status": call.get("status", ""),
+        "start_time": call.get("start_time", ""),
+        "end_time": call.get("end_time", ""),
+        # Matches the dashboard, which shows telephony "to" as the caller
+        "caller": telephony.get("to", ""),
+        "agent_number": telephony.get("from", ""),
+        "summary": call.get("summary", ""),
+        "transcript": call.get("transcript") or [],
+        "error": error,
+    }
+
+
+async def iter_joined(
+    client: CartesiaClient,
+    leads: Iterable[Tuple[str, str]],
+    concurrency: int = 8,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Fetch each lead's call with at most ``concurrency`` requests in flight.
+
+    Rows are yielded as soon as their fetch completes, so output order follows
+    completion rather than input order.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    for item in leads:
+        pending.put_nowait(item)
+    total = pending.qsize()
+    # Bounded so workers stall instead of buffering when the consumer is slow
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def worker() -> None:
+        while True:
+            try:
+                call_id, lead_status = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                row = _join(call_id, lead_status, await client.get_call(call_id))
+            except Exception as exc:
+                # Every lead must yield a row, or the consumer waits forever
+                row = _join(call_id, lead_status, None, error=str(exc) or type(exc).__name__)
+            await results.put(row)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, total))]
+    try:
+        for _ in range(total):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def _transcript_text(transcript: List[Dict[str, Any]]) -> str:
+    return "\n".join(f"{turn.get('role', '')}: {turn.get('text') or ''}" for turn in transcript)
+
+
+def _csv_line(values: List[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(
+    client: CartesiaClient,
+    leads: Iterable[Tuple[str, str]],
+    fmt: str = "csv",
+    concurrency: int = 8,
+) -> AsyncIterator[bytes]:
+    """Encode joined rows as CSV or NDJSON, closing ``client`` when done.
+
+    The caller creates the client so configuration errors fail the request
+    before any response is sent; the stream owns it from then on.
+    """
+    try:
+        if fmt == "csv":
+            yield _csv_line(EXPORT_FIELDS)
+        async for row in iter_joined(client, leads, concurrency=concurrency):
+            if fmt == "csv":
+                row["transcript"] = _transcript_text(row["transcript"])
+                yield _csv_line([row[name] for name in EXPORT_FIELDS])
+            else:
+                yield dumps(row) + b"\n"
+    finally:
+        await client.aclose()
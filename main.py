@@ -1,32 +1,88 @@
-from chat import ChatNode
+from admission import AdmissionController, AdmissionRejected, CallAbandoned
+from config import HOLD_MESSAGE, OVERFLOW_MESSAGE, STARTUP_MODE
+from fastapi.responses import JSONResponse
 from line import Bridge, CallRequest, VoiceAgentApp, VoiceAgentSystem
 from line.events import UserStartedSpeaking, UserStoppedSpeaking, UserTranscriptionReceived
+from loguru import logger
 
 from prompts import get_initial_message
+from warmup import CallResourcePool
+
+# Shared by every call handled by this process
+admission = AdmissionController()
+# ChatNode (and google.genai) is imported through the pool, not at module import
+call_resources = CallResourcePool()
+
+
+async def wait_for_hangup(system: VoiceAgentSystem) -> None:
+    """Return once the caller disconnects; used only before the harness reads the socket."""
+    try:
+        while True:
+            # Anything the caller sends while on hold is dropped
+            message = await system.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+    except RuntimeError:
+        # Starlette raises once the socket is already closed
+        return
 
 
 async def handle_new_call(system: VoiceAgentSystem, _call_request: CallRequest):
-    chat_node = ChatNode()
-    chat_bridge = Bridge(chat_node)
-    system.with_speaking_node(chat_node, chat_bridge)
+    try:
+        await admission.admit(
+            on_queued=lambda: system.harness.send_message(HOLD_MESSAGE),
+            hung_up=lambda: wait_for_hangup(system),
+        )
+    except CallAbandoned:
+        logger.info("Caller hung up while queued")
+        return
+    except AdmissionRejected as exc:
+        logger.warning(f"Rejecting call: {exc}")
+        await system.harness.send_message(OVERFLOW_MESSAGE)
+        await system.harness.end_call()
+        return
 
-    chat_bridge.on(UserTranscriptionReceived).map(chat_node.add_event)
+    try:
+        chat_node = await call_resources.chat_node(admission=admission)
+        chat_bridge = Bridge(chat_node)
+        system.with_speaking_node(chat_node, chat_bridge)
 
-    (
-        chat_bridge.on(UserStoppedSpeaking)
-        .interrupt_on(UserStartedSpeaking, handler=chat_node.on_interrupt_generate)
-        .stream(chat_node.generate)
-        .broadcast()
-    )
+        chat_bridge.on(UserTranscriptionReceived).map(chat_node.add_event)
 
-    await system.start()
-    initial_message = get_initial_message()
-    if initial_message:
-        await system.send_initial_message(initial_message)
-    await system.wait_for_shutdown()
+        (
+            chat_bridge.on(UserStoppedSpeaking)
+            .interrupt_on(UserStartedSpeaking, handler=chat_node.on_interrupt_generate)
+            .stream(chat_node.generate)
+            .broadcast()
+        )
+
+        await system.start()
+        initial_message = get_initial_message()
+        if initial_message:
+            await system.send_initial_message(initial_message)
+        await system.wait_for_shutdown()
+    finally:
+        await admission.release()
 
 
 app = VoiceAgentApp(handle_new_call)
+if STARTUP_MODE == "prewarm":
+    # Uvicorn finishes startup hooks before accepting connections
+    app.fastapi_app.add_event_handler("startup", call_resources.warm)
+app.fastapi_app.add_event_handler("shutdown", call_resources.close)
+
+
+@app.fastapi_app.get("/ready")
+async def readiness() -> JSONResponse:
+    if STARTUP_MODE == "prewarm" and not call_resources.ready:
+        return JSONResponse({"status": "warming"}, status_code=503)
+    return JSONResponse({"status": "ready"})
+
+
+@app.fastapi_app.get("/metrics/admission")
+async def admission_metrics() -> dict:
+    return admission.snapshot()
+
 
 if __name__ == "__main__":
     app.run()
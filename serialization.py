@@ -0,0 +1,32 @@
+"""Shared JSON serialization helpers for both dashboards.
+
+orjson encodes dataclasses (including slot-based ones) natively, so event
+structs can be serialized without building an intermediate dict.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode ``obj`` to compact UTF-8 JSON bytes."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+
+
+def dumps_text(obj: Any) -> str:
+    """Encode ``obj`` to a JSON string, e.g. for websocket text frames."""
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    return orjson.loads(data)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson; used as the default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
@@ -0,0 +1,67 @@
+// Connect to WebSocket for real-time updates
+const ws = new WebSocket(`ws://${window.location.host}/ws`);
+
+ws.onmessage = function(event) {
+    const data = JSON.parse(event.data);
+    console.log('Received:', data);
+
+    if (data.type === 'call_update') {
+        updateCallDisplay(data.call);
+    } else if (data.type === 'call_ended') {
+        removeCallDisplay(data.call_id);
+        updateCallHistory(data.call);
+    }
+};
+
+function updateCallDisplay(call) {
+    let callElement = document.getElementById(`call-${call.call_id}`);
+
+    if (!callElement) {
+        callElement = document.createElement('div');
+        callElement.id = `call-${call.call_id}`;
+        callElement.className = 'p-4 border rounded-lg';
+        document.getElementById('active-calls').prepend(callElement);
+    }
+
+    callElement.innerHTML = `
+        <div class="font-medium">From: ${call.from_number}</div>
+        <div class="text-sm text-gray-600">To: ${call.to_number}</div>
+        <div class="text-sm text-gray-500">Status: ${call.status}</div>
+        <div class="mt-2 text-sm">
+            <div class="font-medium">Transcript:</div>
+            <div class="bg-gray-50 p-2 rounded mt-1 max-h-40 overflow-y-auto">
+                ${call.transcript.map(t =>
+                    `<div class="${t.role === 'user' ? 'text-blue-600' : 'text-green-600'}">
+                        <strong>${t.role}:</strong> ${t.text}
+                    </div>`
+                ).join('')}
+            </div>
+        </div>
+    `;
+}
+
+function removeCallDisplay(callId) {
+    const callElement = document.getElementById(`call-${callId}`);
+    if (callElement) {
+        callElement.remove();
+    }
+}
+
+function updateCallHistory(call) {
+    const historyElement = document.createElement('div');
+    historyElement.className = 'p-3 border-b';
+    historyElement.innerHTML = `
+        <div class="flex justify-between">
+            <div>
+                <span class="font-medium">${call.from_number}</span>
+                <span class="text-sm text-gray-500 ml-2">${new Date(call.start_time).toLocaleString()}</span>
+            </div>
+            <span class="text-sm ${call.status === 'completed' ? 'text-green-600' : 'text-red-600'}">
+                ${call.status}
+            </span>
+        </div>
+    `;
+
+    const historyContainer = document.getElementById('call-history');
+    historyContainer.insertBefore(historyElement, historyContainer.firstChild);
+}
@@ -0,0 +1,158 @@
+const callsEl = document.getElementById('calls');
+const detailsEl = document.getElementById('details');
+const titleEl = document.getElementById('title');
+let selectedId = null;
+
+function renderCallItem(call) {
+  let li = document.getElementById(`call-${call.id}`);
+  const isNew = !li;
+  if (isNew) {
+    li = document.createElement('li');
+    li.id = `call-${call.id}`;
+    li.onclick = () => selectCall(call.id);
+  }
+  const when = call.start_time || 'N/A';
+  const status = call.status;
+  const caller = call.telephony_params?.to || 'Unknown';
+  li.innerHTML = `<div><strong>${caller}</strong> <span class="pill">${status}</span></div><div class="muted">${when}</div>`;
+  return { li, isNew };
+}
+
+// Call events that arrive while the list is (re)loading; replayed afterwards
+// so a change published mid-load is not wiped by the re-render
+let heldEvents = null;
+
+async function loadCalls() {
+  heldEvents = heldEvents || [];
+  try {
+    const res = await fetch('/api/calls');
+    const data = await res.json();
+    callsEl.innerHTML = '';
+    (data.data || []).forEach(call => {
+      callsEl.appendChild(renderCallItem(call).li);
+    });
+  } finally {
+    const held = heldEvents;
+    heldEvents = null;
+    held.forEach(applyCallEvent);
+  }
+}
+
+async function selectCall(id) {
+  selectedId = id;
+  titleEl.textContent = `Call ${id}`;
+  detailsEl.innerHTML = 'Loading...';
+  const [callRes, metaRes] = await Promise.all([
+    fetch(`/api/calls/${id}`),
+    fetch('/api/leads')
+  ]);
+  const call = await callRes.json();
+  const leads = await metaRes.json();
+  const accepted = !!leads.accepted[id];
+  const declined = !!leads.declined[id];
+
+  const transcript = call.transcript || [];
+  const lines = transcript.map(t => `${t.role}: ${t.text || ''}`).join('\n');
+
+  detailsEl.innerHTML = `
+    <div>
+      <div><strong>Status:</strong> ${call.status}</div>
+      <div><strong>From:</strong> ${call.telephony_params?.to || ''}</div>
+      <div><strong>To:</strong> ${call.telephony_params?.from || ''}</div>
+      <div><strong>Summary:</strong> ${call.summary || ''}</div>
+      <div class="mono" style="white-space: pre-wrap; margin-top: 8px;">${lines}</div>
+      <canvas id="waveform" class="waveform" title="Click to jump to this point"></canvas>
+      <audio id="player" controls preload="none" src="/api/calls/${id}/audio"></audio>
+      <div style="margin-top: 8px; display: flex; gap: 8px;">
+        <button class="btn primary" onclick="acceptLead('${id}')" ${accepted ? 'disabled' : ''}>Accept Lead</button>
+        <button class="btn danger" onclick="declineLead('${id}')" ${declined ? 'disabled' : ''}>Decline</button>
+      </div>
+    </div>
+  `;
+  loadWaveform(id);
+}
+
+async function loadWaveform(id) {
+  // Peaks are computed server-side once per call, so scanning needs no audio download
+  const canvas = document.getElementById('waveform');
+  const res = await fetch(`/api/calls/${id}/peaks`);
+  if (!res.ok || id !== selectedId) {
+    if (canvas) canvas.remove();
+    return;
+  }
+  const peaks = await res.json();
+  canvas.width = canvas.clientWidth * window.devicePixelRatio;
+  canvas.height = canvas.clientHeight * window.devicePixelRatio;
+  const ctx = canvas.getContext('2d');
+  const { width, height } = canvas;
+  const secondsToX = s => (s / peaks.duration) * width;
+
+  ctx.fillStyle = '#e8f7ee';
+  peaks.segments.filter(seg => seg.kind === 'speech').forEach(seg => {
+    ctx.fillRect(secondsToX(seg.start), 0, secondsToX(seg.end) - secondsToX(seg.start), height);
+  });
+
+  ctx.fillStyle = '#0b5';
+  const mid = height / 2;
+  // Place bars by time so they line up with the segments and click-to-seek
+  const barWidth = Math.max(secondsToX(1 / peaks.peaks_per_second), 1);
+  peaks.min.forEach((lo, i) => {
+    const hi = peaks.max[i];
+    const top = mid - (hi / peaks.scale) * mid;
+    const bottom = mid - (lo / peaks.scale) * mid;
+    ctx.fillRect(secondsToX(i / peaks.peaks_per_second), top, barWidth, Math.max(bottom - top, 1));
+  });
+
+  canvas.onclick = e => {
+    const player = document.getElementById('player');
+    player.currentTime = (e.offsetX / canvas.clientWidth) * peaks.duration;
+    player.play();
+  };
+}
+
+async function acceptLead(id) {
+  await fetch(`/api/calls/${id}/accept`, { method: 'POST' });
+  await selectCall(id);
+}
+async function declineLead(id) {
+  await fetch(`/api/calls/${id}/decline`, { method: 'POST' });
+  await selectCall(id);
+}
+
+function applyCallEvent(call) {
+  const { li, isNew } = renderCallItem(call);
+  if (isNew) {
+    callsEl.prepend(li);
+  } else if (call.id === selectedId) {
+    selectCall(call.id);
+  }
+}
+
+function subscribe() {
+  // The server pushes only new/changed calls and lead decisions; the browser
+  // resumes from Last-Event-ID automatically after a dropped connection.
+  const events = new EventSource('/api/events');
+  events.addEventListener('call', e => {
+    const call = JSON.parse(e.data);
+    if (heldEvents) {
+      heldEvents.push(call);
+    } else {
+      applyCallEvent(call);
+    }
+  });
+  events.addEventListener('lead', e => {
+    const lead = JSON.parse(e.data);
+    if (lead.call_id === selectedId) {
+      selectCall(lead.call_id);
+    }
+  });
+  events.addEventListener('reset', () => loadCalls());
+  // Resolves once the feed has its cursor; an error still lets the page load
+  return new Promise(resolve => {
+    events.addEventListener('open', resolve, { once: true });
+    events.addEventListener('error', resolve, { once: true });
+  });
+}
+
+// Subscribe before loading so changes published during the load are not lost
+subscribe().then(loadCalls);
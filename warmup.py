@@ -0,0 +1,99 @@
+"""Cold-start support: deferred Gemini imports and prebuilt per-call resources.
+
+Importing ``chat`` pulls in ``google.genai``, which dominates process import
+time, and every ``genai.Client()`` costs tens of milliseconds. The pool
+imports ``chat`` on first use (or from a startup hook), shares one client
+across calls and keeps a few prompts/configs built ahead of demand.
+"""
+
+import asyncio
+import importlib
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Optional
+
+from config import PREWARM_POOL_SIZE
+
+if TYPE_CHECKING:
+    from chat import ChatNode, ChatResources
+
+
+class CallResourcePool:
+    # The system prompt embeds the current time to the minute
+    MAX_AGE_S = 60.0
+    # Entries are rebuilt in the background so an idle replica still has
+    # fresh ones; older than MAX_AGE_S - REFRESH_INTERVAL_S gets replaced
+    REFRESH_INTERVAL_S = MAX_AGE_S / 2
+
+    def __init__(self, size: int = PREWARM_POOL_SIZE) -> None:
+        self.size = size
+        self.ready = False
+        self._chat: Any = None
+        self._client: Any = None
+        self._pool: Deque["ChatResources"] = deque()
+        self._load_lock = asyncio.Lock()
+        self._refresher: Optional[asyncio.Task] = None
+
+    def _import(self) -> None:
+        chat = importlib.import_module("chat")
+        self._client = chat.Client()
+        self._chat = chat
+
+    async def _ensure_loaded(self) -> None:
+        if self._chat is not None:
+            return
+        async with self._load_lock:
+            if self._chat is None:
+                # Heavy import runs off the event loop so live calls keep flowing
+                await asyncio.to_thread(self._import)
+
+    def _refill(self, max_age: Optional[float] = None) -> None:
+        max_age = self.MAX_AGE_S if max_age is None else max_age
+        now = time.monotonic()
+        while self._pool and now - self._pool[0].built_at > max_age:
+            self._pool.popleft()
+        while len(self._pool) < self.size:
+            self._pool.append(self._chat.build_chat_resources())
+
+    async def _refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self.REFRESH_INTERVAL_S)
+            self._refill(max_age=self.MAX_AGE_S - self.REFRESH_INTERVAL_S)
+
+    def _start_refresher(self) -> None:
+        if self.size and self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh())
+
+    async def warm(self) -> None:
+        """Import Gemini, create the shared client and fill the pool."""
+        await self._ensure_loaded()
+        self._refill()
+        self._start_refresher()
+        self.ready = True
+
+    async def close(self) -> None:
+        """Stop the background refresh."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    async def chat_node(self, **kwargs: Any) -> "ChatNode":
+        """Build a ChatNode from pooled resources, importing ``chat`` if needed."""
+        await self._ensure_loaded()
+        resources: Optional["ChatResources"] = None
+        while self._pool:
+            candidate = self._pool.pop()
+            if time.monotonic() - candidate.built_at <= self.MAX_AGE_S:
+                resources = candidate
+                break
+        node = self._chat.ChatNode(resources=resources, client=self._client, **kwargs)
+        if self.size:
+            # Top the pool back up after this call has been set up
+            asyncio.get_running_loop().call_soon(self._refill)
+            self._start_refresher()
+        self.ready = True
+        return node
@@ -0,0 +1,203 @@
+"""Streaming waveform peaks and speech/silence segments for call recordings.
+
+``PeakAccumulator`` consumes a WAV byte stream chunk by chunk. Only the
+current chunk plus less than one bucket of leftover samples is held in
+memory, and min/max/RMS are computed with vectorized NumPy per chunk.
+"""
+
+import struct
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+# Enough resolution to spot where a caller starts speaking
+PEAKS_PER_SECOND = 20
+# Peaks are stored as 8-bit ints in [-PEAK_SCALE, PEAK_SCALE] to keep payloads small
+PEAK_SCALE = 127
+
+SPEECH_THRESHOLD_DBFS = -40.0
+# Shorter silences are bridged so a pause between words does not split speech
+MIN_SILENCE_S = 0.4
+MIN_SPEECH_S = 0.15
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# RIFF writers that stream use these when the final size is unknown
+_UNKNOWN_SIZES = (0, 0xFFFFFFFF)
+
+
+class UnsupportedAudio(ValueError):
+    """The stream is not a WAV encoding this module can decode."""
+
+
+class PeakAccumulator:
+    def __init__(
+        self,
+        peaks_per_second: int = PEAKS_PER_SECOND,
+        speech_threshold_dbfs: float = SPEECH_THRESHOLD_DBFS,
+    ) -> None:
+        self.peaks_per_second = peaks_per_second
+        self.speech_threshold = 10 ** (speech_threshold_dbfs / 20)
+
+        self.sample_rate = 0
+        self.channels = 0
+        self._dtype: Optional[np.dtype] = None
+        self._offset = 0.0
+        self._scale = 1.0
+        self._bucket = 0
+
+        self._header = bytearray()
+        self._data_remaining: Optional[int] = None
+        self._in_data = False
+        self._pending = b""
+        self._leftover = np.empty(0, dtype=np.float32)
+        self._frames = 0
+
+        self._mins: List[int] = []
+        self._maxs: List[int] = []
+        self._voiced: List[bool] = []
+
+    def feed(self, chunk: bytes) -> None:
+        if not self._in_data:
+            self._header += chunk
+            chunk = self._parse_header()
+            if not self._in_data:
+                return
+        if self._data_remaining is not None:
+            chunk = chunk[: self._data_remaining]
+            self._data_remaining -= len(chunk)
+        self._consume(chunk)
+
+    def _parse_header(self) -> bytes:
+        """Parse RIFF chunks up to ``data``; returns any audio bytes already read."""
+        header = self._header
+        if len(header) < 12:
+            return b""
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise UnsupportedAudio("Not a RIFF/WAVE stream")
+        pos = 12
+        while len(header) >= pos + 8:
+            chunk_id = bytes(header[pos : pos + 4])
+            (size,) = struct.unpack_from("<I", header, pos + 4)
+            body = pos + 8
+            if chunk_id == b"data":
+                self._in_data = True
+                self._data_remaining = None if size in _UNKNOWN_SIZES else size
+                if self._dtype is None:
+                    raise UnsupportedAudio("WAV data chunk precedes fmt chunk")
+                audio = bytes(header[body:])
+                self._header = bytearray()
+                return audio
+            if len(header) < body + size + (size & 1):
+                return b""
+            if chunk_id == b"fmt ":
+                self._parse_fmt(bytes(header[body : body + size]))
+            # Chunks are word-aligned
+            pos = body + size + (size & 1)
+        return b""
+
+    def _parse_fmt(self, fmt: bytes) -> None:
+        audio_format, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", fmt)
+        if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            (audio_format,) = struct.unpack_from("<H", fmt, 24)
+        if audio_format == _WAVE_FORMAT_PCM and bits == 8:
+            self._dtype, self._offset, self._scale = np.dtype(np.uint8), 128.0, 128.0
+        elif audio_format == _WAVE_FORMAT_PCM and bits == 16:
+            self._dtype, self._scale = np.dtype("<i2"), 32768.0
+        elif audio_format == _WAVE_FORMAT_PCM and bits == 32:
+            self._dtype, self._scale = np.dtype("<i4"), 2147483648.0
+        elif audio_format == _WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+            self._dtype = np.dtype("<f4")
+        else:
+            raise UnsupportedAudio(f"Unsupported WAV encoding (format {audio_format}, {bits} bits)")
+        if not channels or not sample_rate:
+            raise UnsupportedAudio("WAV header has no channels or sample rate")
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self._bucket = max(sample_rate // self.peaks_per_second, 1)
+
+    def _consume(self, chunk: bytes) -> None:
+        data = self._pending + chunk
+        frame_bytes = self._dtype.itemsize * self.channels
+        usable = len(data) - len(data) % frame_bytes
+        self._pending = data[usable:]
+        if not usable:
+            return
+
+        frames = np.frombuffer(data[:usable], dtype=self._dtype).reshape(-1, self.channels)
+        mono = frames.mean(axis=1, dtype=np.float32)
+        if self._offset or self._scale != 1.0:
+            mono = (mono - self._offset) / self._scale
+        self._frames += len(mono)
+
+        samples = np.concatenate((self._leftover, mono)) if self._leftover.size else mono
+        full = len(samples) // self._bucket * self._bucket
+        self._leftover = samples[full:].copy()
+        if full:
+            self._add_buckets(samples[:full].reshape(-1, self._bucket))
+
+    def _add_buckets(self, buckets: np.ndarray) -> None:
+        mins = np.clip(np.round(buckets.min(axis=1) * PEAK_SCALE), -PEAK_SCALE, PEAK_SCALE)
+        maxs = np.clip(np.round(buckets.max(axis=1) * PEAK_SCALE), -PEAK_SCALE, PEAK_SCALE)
+        rms = np.sqrt(np.mean(np.square(buckets, dtype=np.float32), axis=1))
+        self._mins.extend(mins.astype(np.int8).tolist())
+        self._maxs.extend(maxs.astype(np.int8).tolist())
+        self._voiced.extend((rms >= self.speech_threshold).tolist())
+
+    @property
+    def bucket_seconds(self) -> float:
+        # Buckets hold a whole number of samples, so this can differ from
+        # 1 / peaks_per_second when the rate does not divide evenly
+        return self._bucket / self.sample_rate
+
+    def _segments(self) -> List[Dict[str, Any]]:
+        step = self.bucket_seconds
+        runs: List[List[Any]] = []
+        for voiced in self._voiced:
+            if runs and runs[-1][0] == voiced:
+                runs[-1][1] += 1
+            else:
+                runs.append([voiced, 1])
+
+        # Bridge short pauses and drop blips, then merge neighbours of equal kind
+        merged: List[List[Any]] = []
+        for voiced, length in runs:
+            duration = length * step
+            if merged and ((not voiced and duration < MIN_SILENCE_S) or (voiced and duration < MIN_SPEECH_S)):
+                voiced = merged[-1][0]
+            if merged and merged[-1][0] == voiced:
+                merged[-1][1] += length
+            else:
+                merged.append([voiced, length])
+
+        segments = []
+        start = 0
+        for voiced, length in merged:
+            segments.append({
+                "kind": "speech" if voiced else "silence",
+                "start": round(start * step, 2),
+                "end": round((start + length) * step, 2),
+            })
+            start += length
+        return segments
+
+    def result(self) -> Dict[str, Any]:
+        """Flush the partial last bucket and return peaks plus segments."""
+        if self._dtype is None:
+            raise UnsupportedAudio("Stream ended before any WAV audio data")
+        if self._leftover.size:
+            self._add_buckets(self._leftover.reshape(1, -1))
+            self._leftover = np.empty(0, dtype=np.float32)
+        return {
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "duration": round(self._frames / self.sample_rate, 3),
+            # Effective rate; peak i starts at i / peaks_per_second seconds
+            "peaks_per_second": 1 / self.bucket_seconds,
+            "scale": PEAK_SCALE,
+            "min": self._mins,
+            "max": self._maxs,
+            "segments": self._segments(),
+        }